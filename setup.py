@@ -8,6 +8,10 @@ setup(name='tbdb',
       license='LICENSE',
       packages=['tbdb'],
       install_requires=[
-        "requests >= 2.24.0"
+        "requests >= 2.25.0",
+        "urllib3 >= 1.26.0",
+        "httpx[http2] >= 0.18.0",
+        "ijson >= 3.1",
+        "orjson >= 3.0"
     ]
 )
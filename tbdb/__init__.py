@@ -15,51 +15,362 @@ two members: {'colHeadings': [], 'data': [[]]}
     - colHeadings: List of strings describing columns in data.
     - data: List of lists, where each list represents a table row.
 
+Each query function also has a batch counterpart that takes a list of such dictionaries,
+sends the requests concurrently and returns a list of results in the same order:
+    * getTranscriptsMany()
+    * getParticipantsMany()
+    * getTokensMany()
+    * getTokenTypesMany()
+    * getUtterancesMany()
+    * getNgramsMany()
+    * getCQLMany()
+
+To mix different kinds of queries in one concurrent batch, use:
+    * batch()
+
+If any query in a batch fails, a BatchError is raised whose results attribute still holds the other results.
+
+For large results, getUtterances(), getTokens() and getNgrams() also have iterator counterparts
+that yield rows of 'data' as they are received instead of loading the whole response:
+    * getUtterancesIter()
+    * getTokensIter()
+    * getNgramsIter()
+
 Additional functions return metadata about TalkBankDB: 
     * getPathTrees()
     * validPath()
+
+Query results are cached in memory, so repeating an identical query does not contact TalkBankDB again.
+Each call returns a new result, so results can be modified freely.
+Authenticated queries, the *Iter and *Many functions and batch() are never cached.
+Call clearCache() to discard cached results.
 """
 
 import requests
-import json
+import orjson
 import getpass
+import asyncio
+import concurrent.futures
+import collections
+import gzip
+import httpx
+import ijson
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+
+_BASE = 'https://sla2.talkbank.org:1515/'
+
+# Full URL of every TalkBankDB route; a KeyError here means a misspelled route.
+_ROUTES = {name: _BASE + name for name in (
+    'getTranscriptSummary',
+    'getParticipantSummary',
+    'getUtteranceSummary',
+    'getTokenSummary',
+    'getTokenTypes',
+    'cql',
+    'getNgrams',
+    'getPathTrees'
+)}
+
+# (connect, read) timeout in seconds for every request.  Whole-corpus queries can take
+# minutes on the server, so reads are not capped by default; set e.g. tbdb.requestTimeout = (5, 300) to cap them.
+requestTimeout = (5, None)
+
+# Transient-error policy shared by the sync session and the async batch path.
+_RETRIES = 3
+_BACKOFF_FACTOR = 0.3
+_RETRY_STATUSES = frozenset([502, 503, 504])
+
+# Shared session so consecutive calls reuse pooled keep-alive connections
+# instead of paying a TCP+TLS handshake per request.  TalkBankDB queries are
+# read-only, so it is safe to retry POSTs on connect errors and transient gateway errors.
+# Read errors are not retried (read=0): that would rerun a slow query on the server.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=_RETRIES, read=0, backoff_factor=_BACKOFF_FACTOR, status_forcelist=_RETRY_STATUSES,
+                      allowed_methods=frozenset(['POST']))
+))
+# Responses are large, repetitive JSON.  make_headers() only advertises 'br' when a
+# brotli decoder is installed, so whatever the server picks can be decoded.
+_SESSION.headers.update(make_headers(keep_alive=True, accept_encoding=True))
+
+# Gzip request bodies at least this large (e.g. long 'corpora' or 'cqlArr' lists).
+_GZIP_MIN_BYTES = 1024
 
 
 ########################################
 # Begin Private Functions.
 ########################################
 
+# Values sent for query fields that are not set in queryParams.
+_DEFAULTS = {
+    'corpora': {},
+    'lang': {},
+    'media': {},
+    'age': {},
+    'gender': {},
+    'designType': {},
+    'activityType': {},
+    'groupType': {},
+    'cqlArr': {},
+    'nGram': {},
+    'respType': 'JSON'
+}
+
+# Fields accepted in queryParams; 'respType' is always JSON.
+_ALLOWED = frozenset(['corpusName', 'nsAuth']) | (_DEFAULTS.keys() - {'respType'})
+
+
+# Fields whose list values are sets of alternatives, so their order does not change the result.
+_UNORDERED = frozenset(['corpora', 'lang', 'media', 'gender', 'designType', 'activityType', 'groupType'])
+
+
+_REQUIRED = frozenset(['corpusName'])
+
+# Route and required fields of each public query function, keyed by function name.
+# The *Iter and *Many variants and batch() look up the same entries.
+_QUERIES = {
+    'getTranscripts': ('getTranscriptSummary', _REQUIRED),
+    'getParticipants': ('getParticipantSummary', _REQUIRED),
+    'getUtterances': ('getUtteranceSummary', _REQUIRED),
+    'getTokens': ('getTokenSummary', _REQUIRED),
+    'getTokenTypes': ('getTokenTypes', _REQUIRED),
+    'getCQL': ('cql', _REQUIRED | {'cqlArr'}),
+    'getNgrams': ('getNgrams', _REQUIRED | {'nGram'})
+}
+
+
+def _validate(queryParams, required=_REQUIRED, allowed=_ALLOWED):
+    """
+    Checks queryParams before any request is sent, raising ValueError on missing or unknown fields.
+    Returns a canonical copy, with order-insensitive lists sorted so equivalent queries share a cache entry.
+    """
+    missing = set(required) - queryParams.keys()
+    if missing:
+        raise ValueError('Missing required query field(s): ' + ', '.join(sorted(missing)))
+
+    unknown = queryParams.keys() - allowed
+    if unknown:
+        raise ValueError('Unknown query field(s): ' + ', '.join(sorted(unknown)) +
+                         '. Valid fields are: ' + ', '.join(sorted(allowed)))
+
+    canonical = {}
+    for k in queryParams:
+        v = queryParams[k]
+        if k in _UNORDERED and isinstance(v, list):
+            try:
+                v = sorted(v)
+            except TypeError:
+                pass
+        canonical[k] = v
+
+    return canonical
+
+
+def _prepare(name, queryParams):
+    """Validates queryParams for the public query function name, returning its route and the canonical queryParams."""
+    route, required = _QUERIES[name]
+
+    return route, _validate(queryParams, required)
+
+
+def _buildQuery(queryParams):
+    """Builds the 'queryVals' sent to TalkBankDB from validated queryParams, setting defaults for fields not set."""
+    return {**_DEFAULTS, **queryParams}
+
+
 def _makeReq(queryParams, route, DB_query):
     """Processes request/response from each API function to TalkBankDB."""
 
-    URL = 'https://sla2.talkbank.org:1515/' + route
-
-    # Set default values in query if not set in queryParams.
     if DB_query:
-        query = {
-            'corpusName': queryParams['corpusName'],
-            'corpora':  queryParams['corpora'] if 'corpora' in queryParams else {},
-            'lang': queryParams['lang'] if 'lang' in queryParams else {},
-            'media': queryParams['media'] if 'media' in queryParams else {},
-            'age': queryParams['age'] if 'age' in queryParams else {},
-            'gender': queryParams['gender'] if 'gender' in queryParams else {},
-            'designType': queryParams['designType'] if 'designType' in queryParams else {},
-            'activityType': queryParams['activityType'] if 'activityType' in queryParams else {},
-            'groupType': queryParams['groupType'] if 'groupType' in queryParams else {},
-            'cqlArr': queryParams['cqlArr'] if 'cqlArr' in queryParams else {},
-            'nGram': queryParams['nGram'] if 'nGram' in queryParams else {},
-            'respType': 'JSON'
-        }
-
-        if 'nsAuth' in queryParams:
-            query['nsAuth'] = queryParams['nsAuth']
+        body = {'queryVals': _buildQuery(queryParams)}
+    else:
+        body = {}
+
+    # Never cache authenticated requests, so credentials are not kept around in the cache key.
+    if 'nsAuth' in queryParams:
+        resp = _post(route, orjson.dumps(body))
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
+
+    return _cachedReq(route, orjson.dumps(body, option=orjson.OPT_SORT_KEYS))
+
+
+# Raw response bodies of unauthenticated queries, as {(route, canonical body): (ETag, body, fresh)},
+# least recently used first.  Fresh entries are served without contacting TalkBankDB; stale ones
+# (see clearCache) are revalidated with If-None-Match.  Bodies are parsed on every hit, so each
+# caller gets its own result to modify.
+_CACHE_SIZE = 512
+_RESPONSES = collections.OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _cachedReq(route, payload):
+    """Returns the parsed response for route and canonical JSON body, downloading it only when not cached."""
+    key = (route, payload)
+
+    with _CACHE_LOCK:
+        entry = _RESPONSES.get(key)
+        if entry is not None:
+            _RESPONSES.move_to_end(key)
+
+    if entry is not None and entry[2]:
+        return orjson.loads(entry[1])
+
+    headers = {}
+    if entry is not None:
+        headers['If-None-Match'] = entry[0]
+
+    resp = _post(route, payload, headers)
+
+    # Unchanged since the last download, reuse the body read before the request, which may since
+    # have been evicted by another thread.  Without a body to reuse, ask for the full response.
+    if resp.status_code == 304 and entry is None:
+        resp = _post(route, payload)
+
+    if resp.status_code == 304:
+        etag, body = entry[0], entry[1]
+    else:
+        # Raising keeps error responses out of the cache.
+        resp.raise_for_status()
+        etag, body = resp.headers.get('ETag'), resp.content
+
+    with _CACHE_LOCK:
+        _RESPONSES[key] = (etag, body, True)
+        _RESPONSES.move_to_end(key)
+        if len(_RESPONSES) > _CACHE_SIZE:
+            _RESPONSES.popitem(last=False)
+
+    return orjson.loads(body)
+
+
+def _encodeBody(payload):
+    """Returns the request body and headers for a serialized JSON payload, gzipping large payloads."""
+    data = payload
+    headers = {'Content-Type': 'application/json'}
+
+    if len(data) >= _GZIP_MIN_BYTES:
+        data = gzip.compress(data)
+        headers['Content-Encoding'] = 'gzip'
+
+    return data, headers
+
+
+def _post(route, payload, extraHeaders=None):
+    """Sends an already serialized JSON payload to route and returns the response."""
+
+    URL = _ROUTES[route]
+    data, headers = _encodeBody(payload)
+    if extraHeaders:
+        headers.update(extraHeaders)
+
+    return _SESSION.post(URL, data=data, headers=headers, timeout=requestTimeout)
+
+
+def _makeReqStream(queryParams, route):
+    """Yields rows of 'data' from a TalkBankDB response as they are parsed, without buffering the whole body."""
+
+    URL = _ROUTES[route]
+    data, headers = _encodeBody(orjson.dumps({'queryVals': _buildQuery(queryParams)}))
+
+    with _SESSION.post(URL, data=data, headers=headers, timeout=requestTimeout, stream=True) as resp:
+        # An error response has no 'data' rows, so surface it instead of yielding nothing.
+        resp.raise_for_status()
+
+        # ijson reads the raw socket stream, so have urllib3 undo any Content-Encoding first.
+        # use_float matches the floats orjson returns for the non-streaming functions.
+        resp.raw.decode_content = True
+        yield from ijson.items(resp.raw, 'data.item', use_float=True)
+
+
+_pathTreeCache = None
+
+
+def _getPathTreesCached():
+    """Returns the path tree, fetching it from TalkBankDB only on first use."""
+    global _pathTreeCache
+
+    if _pathTreeCache is None:
+        _pathTreeCache = getPathTrees()
+
+    return _pathTreeCache
+
+
+async def _makeReqAsync(session, queryParams, route, DB_query):
+    """Async counterpart of _makeReq, sending the request on a shared httpx.AsyncClient."""
+
+    URL = _ROUTES[route]
 
     if DB_query:
-        resp = requests.post(URL, json={'queryVals': query})
+        body = {'queryVals': _buildQuery(queryParams)}
     else:
-        resp = requests.post(URL, json={})
+        body = {}
+
+    content, headers = _encodeBody(orjson.dumps(body))
+
+    # Retry transient gateway errors with backoff, like the sync session; connect errors are
+    # retried by the transport.
+    for attempt in range(_RETRIES + 1):
+        resp = await session.post(URL, content=content, headers=headers)
+        if resp.status_code not in _RETRY_STATUSES or attempt == _RETRIES:
+            break
+        await asyncio.sleep(_BACKOFF_FACTOR * 2 ** attempt)
+
+    resp.raise_for_status()
+
+    # Parse in a worker thread so decoding a large response does not stall the other requests in flight.
+    return await asyncio.get_running_loop().run_in_executor(None, orjson.loads, resp.content)
+
+
+async def _gatherReqs(reqs):
+    """Sends each (route, queryParams) request in reqs concurrently, at most 8 in flight at a time."""
+    sem = asyncio.Semaphore(8)
+
+    # Over HTTP/2 all requests are multiplexed on one connection; the connection limit
+    # only matters if the server falls back to HTTP/1.1.
+    limits = httpx.Limits(max_connections=16, max_keepalive_connections=16, keepalive_expiry=60)
+    timeout = httpx.Timeout(requestTimeout[1], connect=requestTimeout[0])
+
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=_RETRIES)
+
+    async with httpx.AsyncClient(transport=transport, timeout=timeout) as session:
+        async def boundedReq(route, queryParams):
+            async with sem:
+                return await _makeReqAsync(session, queryParams, route, True)
+
+        results = await asyncio.gather(*[boundedReq(route, queryParams) for route, queryParams in reqs],
+                                       return_exceptions=True)
+
+    # Keep the successful results when some queries fail, rather than discarding the whole batch.
+    if any(isinstance(result, Exception) for result in results):
+        raise BatchError(results)
+
+    return results
+
+
+def _makeReqMany(reqs, auth):
+    """Runs the batch of (route, queryParams) requests to completion and returns results in order."""
+
+    # Prompt once and use the same credentials for every request in the batch.
+    if auth:
+        nsAuth = _authenticate()
+        for route, queryParams in reqs:
+            queryParams['nsAuth'] = nsAuth
 
-    return json.loads(resp.text)
+    # asyncio.run() cannot be nested in an already running event loop (e.g. Jupyter/IPython),
+    # so in that case run the batch on its own loop in a worker thread.
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_gatherReqs(reqs))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(_gatherReqs(reqs))).result()
 
 
 def _authenticate():
@@ -85,6 +396,23 @@ def _authenticate():
 # Begin Public API.
 ########################################
 
+class BatchError(Exception):
+    """
+    Raised by the *Many functions and batch() when one or more queries in the batch fail.
+
+    Attributes
+    ----------
+    results: list
+        One entry per query, in order: the result of each query that succeeded,
+        or the exception raised by each query that failed.
+    """
+
+    def __init__(self, results):
+        failed = sum(isinstance(result, Exception) for result in results)
+        super().__init__('{} of {} queries failed'.format(failed, len(results)))
+        self.results = results
+
+
 def getTranscripts(queryParams, auth=False):
     """
     Get transcript metadata where each row represents a transcript.
@@ -146,10 +474,12 @@ def getTranscripts(queryParams, auth=False):
     tbdb.getTranscripts({'corpusName': 'childes', 'corpora': [['childes','Eng-NA','MacWhinney', '010411a']]})
     """
 
+    route, queryParams = _prepare('getTranscripts', queryParams)
+
     if auth:
         queryParams['nsAuth'] = _authenticate()
 
-    return _makeReq(queryParams, 'getTranscriptSummary', True)
+    return _makeReq(queryParams, route, True)
 
 
 def getParticipants(queryParams, auth=False):
@@ -218,10 +548,12 @@ def getParticipants(queryParams, auth=False):
     tbdb.getParticipants({'corpusName': 'childes', 'corpora': [['childes','Eng-NA','MacWhinney', '010411a']]})
     """
     
+    route, queryParams = _prepare('getParticipants', queryParams)
+
     if auth:
         queryParams['nsAuth'] = _authenticate()
 
-    return _makeReq(queryParams, 'getParticipantSummary', True)
+    return _makeReq(queryParams, route, True)
 
 
 def getUtterances(queryParams, auth=False):
@@ -288,10 +620,12 @@ def getUtterances(queryParams, auth=False):
     tbdb.getUtterances({'corpusName': 'childes', 'corpora': [['childes','Eng-NA','MacWhinney', '010411a']]})
     """
 
+    route, queryParams = _prepare('getUtterances', queryParams)
+
     if auth:
         queryParams['nsAuth'] = _authenticate()
 
-    return _makeReq(queryParams, 'getUtteranceSummary', True)
+    return _makeReq(queryParams, route, True)
 
 
 def getTokens(queryParams, auth=False):
@@ -356,10 +690,12 @@ def getTokens(queryParams, auth=False):
     tbdb.getTokens({'corpusName': 'childes', 'corpora': [['childes','Eng-NA','MacWhinney', '010411a']]})
     """
 
+    route, queryParams = _prepare('getTokens', queryParams)
+
     if auth:
         queryParams['nsAuth'] = _authenticate()
 
-    return _makeReq(queryParams, 'getTokenSummary', True)
+    return _makeReq(queryParams, route, True)
 
 
 def getTokenTypes(queryParams, auth=False):
@@ -418,10 +754,12 @@ def getTokenTypes(queryParams, auth=False):
 
     tbdb.getTokenTypes({'corpusName': 'childes', 'corpora': [['childes','Eng-NA','MacWhinney', '010411a']]})
     """
+    route, queryParams = _prepare('getTokenTypes', queryParams)
+
     if auth:
         queryParams['nsAuth'] = _authenticate()
 
-    return _makeReq(queryParams, 'getTokenTypes', True)
+    return _makeReq(queryParams, route, True)
 
 
 def getCQL(queryParams, auth=False):
@@ -538,10 +876,12 @@ def getCQL(queryParams, auth=False):
         })
     """
 
+    route, queryParams = _prepare('getCQL', queryParams)
+
     if auth:
         queryParams['nsAuth'] = _authenticate()
 
-    return _makeReq(queryParams, 'cql', True)
+    return _makeReq(queryParams, route, True)
 
 
 def getNgrams(queryParams, auth=False):
@@ -611,10 +951,308 @@ def getNgrams(queryParams, auth=False):
             'corpora': [['childes', 'Eng-NA', 'MacWhinney', '010411a']]
         })
     """
+    route, queryParams = _prepare('getNgrams', queryParams)
+
+    if auth:
+        queryParams['nsAuth'] = _authenticate()
+
+    return _makeReq(queryParams, route, True)
+
+
+def getUtterancesIter(queryParams, auth=False):
+    """
+    Iterate over the rows of a getUtterances() query as they arrive, instead of loading the whole result into memory.
+    Useful for large corpora.  Results are not cached.
+
+    Parameters
+    ----------
+    queryParams: dict
+        Query dictionary taking the same fields as getUtterances().
+    auth: bool, default False
+        Determine if user should be prompted to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        iterator of list
+            Each item is one row of the 'data' member returned by getUtterances().
+
+    Examples
+    --------
+    for row in tbdb.getUtterancesIter({'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}):
+        print(row)
+    """
+
+    route, queryParams = _prepare('getUtterances', queryParams)
+
+    if auth:
+        queryParams['nsAuth'] = _authenticate()
+
+    return _makeReqStream(queryParams, route)
+
+
+def getTokensIter(queryParams, auth=False):
+    """
+    Iterate over the rows of a getTokens() query as they arrive, instead of loading the whole result into memory.
+    Useful for large corpora.  Results are not cached.
+
+    Parameters
+    ----------
+    queryParams: dict
+        Query dictionary taking the same fields as getTokens().
+    auth: bool, default False
+        Determine if user should be prompted to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        iterator of list
+            Each item is one row of the 'data' member returned by getTokens().
+
+    Examples
+    --------
+    for row in tbdb.getTokensIter({'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}):
+        print(row)
+    """
+
+    route, queryParams = _prepare('getTokens', queryParams)
+
+    if auth:
+        queryParams['nsAuth'] = _authenticate()
+
+    return _makeReqStream(queryParams, route)
+
+
+def getNgramsIter(queryParams, auth=False):
+    """
+    Iterate over the rows of a getNgrams() query as they arrive, instead of loading the whole result into memory.
+    Useful for large corpora.  Results are not cached.
+
+    Parameters
+    ----------
+    queryParams: dict
+        Query dictionary taking the same fields as getNgrams().
+    auth: bool, default False
+        Determine if user should be prompted to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        iterator of list
+            Each item is one row of the 'data' member returned by getNgrams().
+
+    Examples
+    --------
+    for row in tbdb.getNgramsIter({'nGram': {'size': '3', 'type': 'word'}, 'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}):
+        print(row)
+    """
+
+    route, queryParams = _prepare('getNgrams', queryParams)
+
     if auth:
         queryParams['nsAuth'] = _authenticate()
 
-    return _makeReq(queryParams, 'getNgrams', True)
+    return _makeReqStream(queryParams, route)
+
+
+def getTranscriptsMany(paramList, auth=False):
+    """
+    Run several getTranscripts() queries concurrently.  Results are not cached.
+
+    Parameters
+    ----------
+    paramList: list of dict
+        List of query dictionaries, each taking the same fields as getTranscripts().
+    auth: bool, default False
+        Determine if user should be prompted (once, for the whole batch) to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        list of dict
+            One result per query dictionary, in the same order as paramList.  See getTranscripts() for the layout of each result.
+
+    Raises
+    ------
+        BatchError
+            If any query fails.  Its results attribute holds the results of the others.
+
+    Examples
+    --------
+    tbdb.getTranscriptsMany([{'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}, {'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'Brown']]}])
+    """
+
+    return _makeReqMany([_prepare('getTranscripts', queryParams) for queryParams in paramList], auth)
+
+
+def getParticipantsMany(paramList, auth=False):
+    """
+    Run several getParticipants() queries concurrently.  Results are not cached.
+
+    Parameters
+    ----------
+    paramList: list of dict
+        List of query dictionaries, each taking the same fields as getParticipants().
+    auth: bool, default False
+        Determine if user should be prompted (once, for the whole batch) to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        list of dict
+            One result per query dictionary, in the same order as paramList.  See getParticipants() for the layout of each result.
+
+    Raises
+    ------
+        BatchError
+            If any query fails.  Its results attribute holds the results of the others.
+
+    Examples
+    --------
+    tbdb.getParticipantsMany([{'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}, {'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'Brown']]}])
+    """
+
+    return _makeReqMany([_prepare('getParticipants', queryParams) for queryParams in paramList], auth)
+
+
+def getUtterancesMany(paramList, auth=False):
+    """
+    Run several getUtterances() queries concurrently.  Results are not cached.
+
+    Parameters
+    ----------
+    paramList: list of dict
+        List of query dictionaries, each taking the same fields as getUtterances().
+    auth: bool, default False
+        Determine if user should be prompted (once, for the whole batch) to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        list of dict
+            One result per query dictionary, in the same order as paramList.  See getUtterances() for the layout of each result.
+
+    Raises
+    ------
+        BatchError
+            If any query fails.  Its results attribute holds the results of the others.
+
+    Examples
+    --------
+    tbdb.getUtterancesMany([{'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}, {'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'Brown']]}])
+    """
+
+    return _makeReqMany([_prepare('getUtterances', queryParams) for queryParams in paramList], auth)
+
+
+def getTokensMany(paramList, auth=False):
+    """
+    Run several getTokens() queries concurrently.  Results are not cached.
+
+    Parameters
+    ----------
+    paramList: list of dict
+        List of query dictionaries, each taking the same fields as getTokens().
+    auth: bool, default False
+        Determine if user should be prompted (once, for the whole batch) to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        list of dict
+            One result per query dictionary, in the same order as paramList.  See getTokens() for the layout of each result.
+
+    Raises
+    ------
+        BatchError
+            If any query fails.  Its results attribute holds the results of the others.
+
+    Examples
+    --------
+    tbdb.getTokensMany([{'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}, {'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'Brown']]}])
+    """
+
+    return _makeReqMany([_prepare('getTokens', queryParams) for queryParams in paramList], auth)
+
+
+def getTokenTypesMany(paramList, auth=False):
+    """
+    Run several getTokenTypes() queries concurrently.  Results are not cached.
+
+    Parameters
+    ----------
+    paramList: list of dict
+        List of query dictionaries, each taking the same fields as getTokenTypes().
+    auth: bool, default False
+        Determine if user should be prompted (once, for the whole batch) to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        list of dict
+            One result per query dictionary, in the same order as paramList.  See getTokenTypes() for the layout of each result.
+
+    Raises
+    ------
+        BatchError
+            If any query fails.  Its results attribute holds the results of the others.
+
+    Examples
+    --------
+    tbdb.getTokenTypesMany([{'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}, {'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'Brown']]}])
+    """
+
+    return _makeReqMany([_prepare('getTokenTypes', queryParams) for queryParams in paramList], auth)
+
+
+def getCQLMany(paramList, auth=False):
+    """
+    Run several getCQL() queries concurrently.  Results are not cached.
+
+    Parameters
+    ----------
+    paramList: list of dict
+        List of query dictionaries, each taking the same fields as getCQL().
+    auth: bool, default False
+        Determine if user should be prompted (once, for the whole batch) to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        list of dict
+            One result per query dictionary, in the same order as paramList.  See getCQL() for the layout of each result.
+
+    Raises
+    ------
+        BatchError
+            If any query fails.  Its results attribute holds the results of the others.
+
+    Examples
+    --------
+    tbdb.getCQLMany([{'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']], 'cqlArr': [{'type': 'word', 'item': 'ball', 'freq': 'once'}]}, {'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'Brown']], 'cqlArr': [{'type': 'word', 'item': 'ball', 'freq': 'once'}]}])
+    """
+
+    return _makeReqMany([_prepare('getCQL', queryParams) for queryParams in paramList], auth)
+
+
+def getNgramsMany(paramList, auth=False):
+    """
+    Run several getNgrams() queries concurrently.  Results are not cached.
+
+    Parameters
+    ----------
+    paramList: list of dict
+        List of query dictionaries, each taking the same fields as getNgrams().
+    auth: bool, default False
+        Determine if user should be prompted (once, for the whole batch) to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        list of dict
+            One result per query dictionary, in the same order as paramList.  See getNgrams() for the layout of each result.
+
+    Raises
+    ------
+        BatchError
+            If any query fails.  Its results attribute holds the results of the others.
+
+    Examples
+    --------
+    tbdb.getNgramsMany([{'nGram': {'size': '3', 'type': 'word'}, 'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}, {'nGram': {'size': '3', 'type': 'word'}, 'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'Brown']]}])
+    """
+
+    return _makeReqMany([_prepare('getNgrams', queryParams) for queryParams in paramList], auth)
 
 
 def getPathTrees():
@@ -629,6 +1267,35 @@ def getPathTrees():
     return _makeReq({}, 'getPathTrees', False)
 
 
+def clearCache(revalidate=False):
+    """
+    Clear cached query results.
+    Responses are cached in memory for the lifetime of the session, so repeated identical queries
+    do not go back to TalkBankDB.  Call this to force fresh results, e.g. after TalkBankDB data is updated.
+
+    Parameters
+    ----------
+    revalidate: bool, default False
+        Keep previous responses that have a validator (ETag), so repeated queries ask TalkBankDB whether
+        the data has changed and are only downloaded again if it has.  Defaults to False, which frees all cached data.
+    """
+    global _pathTreeCache
+
+    _pathTreeCache = None
+
+    with _CACHE_LOCK:
+        if not revalidate:
+            _RESPONSES.clear()
+            return
+
+        # Keep only responses that can be revalidated, marked stale.
+        for key, (etag, body, fresh) in list(_RESPONSES.items()):
+            if etag:
+                _RESPONSES[key] = (etag, body, False)
+            else:
+                del _RESPONSES[key]
+
+
 def validPath(targetPath):
     """
     Check for valid path
@@ -657,16 +1324,53 @@ def validPath(targetPath):
     validPath(['childes', 'childes', 'somethingThatDoesNotExist']);
     """
 
-    def checkPath(targetPath, pathTree=getPathTrees()):
-        # Successfully walked down targetPath in pathTree.
-        if len(targetPath) == 0:
-            return True
-
-        # If targetPath so far is valid, continue down path.
-        if targetPath[0] in pathTree:
-            checkPath(targetPath[1:len(targetPath)], pathTree[targetPath[0]])
-        else:
-            print('Invalid path at: ' + targetPath[0])
+    # Walk down targetPath in the path tree, stopping at the first missing level.
+    node = _getPathTreesCached()
+    for segment in ['respMsg'] + targetPath:
+        # Stop at leaves too, so a path running past a transcript is invalid rather than a TypeError.
+        if not isinstance(node, dict) or segment not in node:
+            print('Invalid path at: ' + segment)
             return False
+        node = node[segment]
+
+    return True
+
+
+def batch(queries, auth=False):
+    """
+    Run a mix of different queries concurrently.  Results are not cached.
+
+    Parameters
+    ----------
+    queries: list of tuple
+        List of (function, queryParams) pairs, where function is one of getTranscripts, getParticipants,
+        getUtterances, getTokens, getTokenTypes, getCQL or getNgrams, and queryParams is the dictionary it would be called with.
+    auth: bool, default False
+        Determine if user should be prompted (once, for the whole batch) to authenticate in order to access protected collections. Defaults to False.
+
+    Returns
+    -------
+        list of dict
+            One result per query, in the same order as queries.
+
+    Raises
+    ------
+        BatchError
+            If any query fails.  Its results attribute holds the results of the others.
+
+    Examples
+    --------
+    Get transcript metadata and token types for the same collection:
+
+    params = {'corpusName': 'childes', 'corpora': [['childes', 'Eng-NA', 'MacWhinney']]}
+    transcripts, tokenTypes = tbdb.batch([(tbdb.getTranscripts, params), (tbdb.getTokenTypes, params)])
+    """
+
+    reqs = []
+    for fn, queryParams in queries:
+        name = getattr(fn, '__name__', None)
+        if name not in _QUERIES or globals()[name] is not fn:
+            raise ValueError('batch() does not support ' + (name or repr(fn)))
+        reqs.append(_prepare(name, queryParams))
 
-    return checkPath(['respMsg'] + targetPath, getPathTrees())
+    return _makeReqMany(reqs, auth)
@@ -0,0 +1,380 @@
+import asyncio
+import gzip
+import io
+import unittest
+from unittest import mock
+
+import httpx
+import orjson
+import requests
+import urllib3
+
+import tbdb
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.content = orjson.dumps(body) if body is not None else b''
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code), response=self)
+
+
+def streamResponse(body, status_code=200):
+    """A real requests.Response whose raw stream is a gzip-encoded urllib3 response, as _makeReqStream reads it."""
+    raw = urllib3.HTTPResponse(body=io.BytesIO(gzip.compress(orjson.dumps(body))), headers={'Content-Encoding': 'gzip'},
+                               status=status_code, preload_content=False, decode_content=False)
+
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.reason = 'Error' if status_code >= 400 else 'OK'
+    resp.url = tbdb._ROUTES['getTokenSummary']
+    resp.raw = raw
+    return resp
+
+
+class FakeSession:
+    """Stands in for tbdb._SESSION, replaying canned responses and recording each post."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def post(self, url, data=None, headers=None, timeout=None, stream=False):
+        self.calls.append({'url': url, 'data': data, 'headers': dict(headers)})
+        return self.responses.pop(0)
+
+
+class TBDBTestCase(unittest.TestCase):
+    def setUp(self):
+        tbdb.clearCache()
+        self.addCleanup(tbdb.clearCache)
+
+    def useSession(self, *responses):
+        session = FakeSession(*responses)
+        patcher = mock.patch.object(tbdb, '_SESSION', session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return session
+
+
+class AsyncTestCase(TBDBTestCase):
+    """Runs the *Many/batch() path against an httpx.MockTransport instead of the network."""
+
+    def useTransport(self, handler):
+        sent = []
+
+        def record(request):
+            sent.append(request)
+            return handler(request)
+
+        patcher = mock.patch.object(tbdb.httpx, 'AsyncHTTPTransport', lambda **kwargs: httpx.MockTransport(record))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return sent
+
+
+def queryVals(request):
+    """Decodes the query sent in a request captured by httpx.MockTransport."""
+    content = request.content
+    if request.headers.get('Content-Encoding') == 'gzip':
+        content = gzip.decompress(content)
+    return orjson.loads(content)['queryVals']
+
+
+class ValidateTest(unittest.TestCase):
+    def test_missing_required_field(self):
+        with self.assertRaisesRegex(ValueError, 'cqlArr'):
+            tbdb._validate({'corpusName': 'childes'}, tbdb._QUERIES['getCQL'][1])
+
+    def test_unknown_field(self):
+        with self.assertRaisesRegex(ValueError, 'Corpora'):
+            tbdb._validate({'corpusName': 'childes', 'Corpora': []})
+
+    def test_sorts_order_insensitive_lists_only(self):
+        cqlArr = [{'type': 'word', 'item': 'go'}, {'type': 'word', 'item': 'home'}]
+        queryParams = {'corpusName': 'childes', 'lang': ['spa', 'eng'], 'corpora': [['childes', 'b'], ['childes', 'a']], 'cqlArr': cqlArr}
+
+        canonical = tbdb._validate(queryParams)
+
+        self.assertEqual(canonical['lang'], ['eng', 'spa'])
+        self.assertEqual(canonical['corpora'], [['childes', 'a'], ['childes', 'b']])
+        self.assertEqual(canonical['cqlArr'], cqlArr)
+        self.assertEqual(queryParams['lang'], ['spa', 'eng'])
+
+
+class BuildQueryTest(unittest.TestCase):
+    def test_fills_defaults(self):
+        query = tbdb._buildQuery({'corpusName': 'childes', 'lang': ['eng']})
+
+        self.assertEqual(query['corpusName'], 'childes')
+        self.assertEqual(query['lang'], ['eng'])
+        self.assertEqual(query['media'], {})
+        self.assertEqual(query['respType'], 'JSON')
+
+
+class ValidPathTest(TBDBTestCase):
+    def setUp(self):
+        super().setUp()
+        self.session = self.useSession(FakeResponse(body={'respMsg': {'childes': {'Eng-NA': {'010411a': 'file'}}}}))
+
+    def test_valid_path(self):
+        self.assertTrue(tbdb.validPath(['childes', 'Eng-NA']))
+
+    def test_invalid_path(self):
+        self.assertFalse(tbdb.validPath(['childes', 'somethingThatDoesNotExist']))
+
+    def test_path_past_leaf_is_invalid(self):
+        self.assertFalse(tbdb.validPath(['childes', 'Eng-NA', '010411a', 'f']))
+
+    def test_path_tree_fetched_once(self):
+        tbdb.validPath(['childes'])
+        tbdb.validPath(['childes', 'Eng-NA'])
+
+        self.assertEqual(len(self.session.calls), 1)
+
+
+class CacheTest(TBDBTestCase):
+    result = {'colHeadings': ['a'], 'data': [[1.5]]}
+
+    def test_repeated_query_is_cached(self):
+        session = self.useSession(FakeResponse(body=self.result))
+
+        first = tbdb.getTokens({'corpusName': 'childes', 'lang': ['spa', 'eng']})
+        second = tbdb.getTokens({'corpusName': 'childes', 'lang': ['eng', 'spa']})
+
+        self.assertEqual(first, self.result)
+        self.assertEqual(second, self.result)
+        self.assertEqual(len(session.calls), 1)
+
+    def test_cached_results_are_independent_copies(self):
+        self.useSession(FakeResponse(body=self.result))
+
+        first = tbdb.getTokens({'corpusName': 'childes'})
+        first['data'].append('mutated')
+        del first['colHeadings']
+
+        self.assertEqual(tbdb.getTokens({'corpusName': 'childes'}), self.result)
+
+    def test_error_response_is_not_cached(self):
+        session = self.useSession(FakeResponse(status_code=500, body={'error': 'db down'}), FakeResponse(body=self.result))
+
+        with self.assertRaises(requests.HTTPError):
+            tbdb.getTokens({'corpusName': 'childes'})
+
+        self.assertEqual(tbdb.getTokens({'corpusName': 'childes'}), self.result)
+        self.assertEqual(len(session.calls), 2)
+
+    def test_authenticated_query_bypasses_cache(self):
+        session = self.useSession(FakeResponse(body=self.result), FakeResponse(body=self.result))
+        queryParams = {'corpusName': 'childes', 'nsAuth': [{'path': 'aphasia', 'userID': 'u', 'pswd': 'p'}]}
+
+        tbdb.getTokens(queryParams)
+        tbdb.getTokens(queryParams)
+
+        self.assertEqual(len(session.calls), 2)
+        self.assertEqual(len(tbdb._RESPONSES), 0)
+
+    def test_not_modified_reuses_stored_body(self):
+        session = self.useSession(FakeResponse(body=self.result, headers={'ETag': '"v1"'}), FakeResponse(status_code=304))
+
+        first = tbdb.getTokens({'corpusName': 'childes'})
+        first['data'].append('mutated')
+        tbdb.clearCache(revalidate=True)
+        second = tbdb.getTokens({'corpusName': 'childes'})
+
+        self.assertEqual(session.calls[1]['headers']['If-None-Match'], '"v1"')
+        self.assertEqual(second, self.result)
+
+    def test_cache_is_bounded(self):
+        session = self.useSession(*[FakeResponse(body=self.result) for i in range(3)])
+
+        with mock.patch.object(tbdb, '_CACHE_SIZE', 1):
+            tbdb.getTokens({'corpusName': 'a'})
+            tbdb.getTokens({'corpusName': 'b'})
+            tbdb.getTokens({'corpusName': 'a'})
+
+        self.assertEqual(len(session.calls), 3)
+        self.assertEqual(len(tbdb._RESPONSES), 1)
+
+    def test_not_modified_after_concurrent_eviction(self):
+        session = self.useSession(FakeResponse(body=self.result, headers={'ETag': '"v1"'}), FakeResponse(status_code=304))
+
+        tbdb.getTokens({'corpusName': 'childes'})
+        tbdb.clearCache(revalidate=True)
+
+        # Another thread clears the cache while the revalidation request is in flight.
+        post = session.post
+        def postAndEvict(*args, **kwargs):
+            tbdb.clearCache()
+            return post(*args, **kwargs)
+
+        with mock.patch.object(session, 'post', postAndEvict):
+            self.assertEqual(tbdb.getTokens({'corpusName': 'childes'}), self.result)
+
+    def test_unsolicited_not_modified_refetches(self):
+        session = self.useSession(FakeResponse(status_code=304), FakeResponse(body=self.result))
+
+        self.assertEqual(tbdb.getTokens({'corpusName': 'childes'}), self.result)
+        self.assertEqual(len(session.calls), 2)
+        self.assertNotIn('If-None-Match', session.calls[1]['headers'])
+
+    def test_clear_cache_drops_etags(self):
+        session = self.useSession(FakeResponse(body=self.result, headers={'ETag': '"v1"'}), FakeResponse(body=self.result))
+
+        tbdb.getTokens({'corpusName': 'childes'})
+        tbdb.clearCache()
+        tbdb.getTokens({'corpusName': 'childes'})
+
+        self.assertNotIn('If-None-Match', session.calls[1]['headers'])
+
+
+class EncodeBodyTest(unittest.TestCase):
+    def test_small_body_sent_as_is(self):
+        payload = b'x' * (tbdb._GZIP_MIN_BYTES - 1)
+
+        data, headers = tbdb._encodeBody(payload)
+
+        self.assertEqual(data, payload)
+        self.assertNotIn('Content-Encoding', headers)
+
+    def test_large_body_gzipped(self):
+        payload = b'x' * tbdb._GZIP_MIN_BYTES
+
+        data, headers = tbdb._encodeBody(payload)
+
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        self.assertEqual(gzip.decompress(data), payload)
+
+
+class AsyncEncodingTest(AsyncTestCase):
+    def test_large_batch_bodies_gzipped(self):
+        sent = self.useTransport(lambda request: httpx.Response(200, json={'data': []}))
+        corpora = [['childes', 'Eng-NA', str(i)] for i in range(100)]
+
+        tbdb.getTranscriptsMany([{'corpusName': 'childes', 'corpora': corpora}])
+
+        self.assertEqual(sent[0].headers['Content-Encoding'], 'gzip')
+        self.assertEqual(queryVals(sent[0])['corpora'], sorted(corpora))
+
+
+class StreamTest(TBDBTestCase):
+    def test_yields_rows_from_gzipped_stream(self):
+        self.useSession(streamResponse({'colHeadings': ['word', 'freq'], 'data': [['ball', 1.5], ['go', 2]]}))
+
+        rows = list(tbdb.getTokensIter({'corpusName': 'childes'}))
+
+        self.assertEqual(rows, [['ball', 1.5], ['go', 2]])
+        self.assertIs(type(rows[0][1]), float)
+
+    def test_error_response_raises(self):
+        self.useSession(streamResponse({'error': 'db down'}, status_code=500))
+
+        with self.assertRaises(requests.HTTPError):
+            list(tbdb.getTokensIter({'corpusName': 'childes'}))
+
+
+class ManyTest(AsyncTestCase):
+    async def slowerForEarlierQueries(self, request):
+        # Finish the queries in reverse order, to check results come back in input order anyway.
+        name = queryVals(request)['corpusName']
+        await asyncio.sleep(0.01 * (3 - int(name)))
+        return httpx.Response(200, json={'data': [[name]]})
+
+    def test_results_in_input_order(self):
+        self.useTransport(self.slowerForEarlierQueries)
+
+        results = tbdb.getTranscriptsMany([{'corpusName': str(i)} for i in range(3)])
+
+        self.assertEqual(results, [{'data': [['0']]}, {'data': [['1']]}, {'data': [['2']]}])
+
+    def test_runs_inside_running_event_loop(self):
+        self.useTransport(self.slowerForEarlierQueries)
+
+        async def notebookCell():
+            return tbdb.getTranscriptsMany([{'corpusName': '0'}, {'corpusName': '1'}])
+
+        self.assertEqual(asyncio.run(notebookCell()), [{'data': [['0']]}, {'data': [['1']]}])
+
+    def test_authenticates_once_for_the_batch(self):
+        sent = self.useTransport(lambda request: httpx.Response(200, json={'data': []}))
+        nsAuth = [{'path': 'aphasia', 'userID': 'u', 'pswd': 'p'}]
+
+        with mock.patch.object(tbdb, '_authenticate', return_value=nsAuth) as authenticate:
+            tbdb.getTokensMany([{'corpusName': 'aphasia'}, {'corpusName': 'aphasia'}], auth=True)
+
+        authenticate.assert_called_once()
+        self.assertEqual([queryVals(request)['nsAuth'] for request in sent], [nsAuth, nsAuth])
+
+
+class BatchTest(AsyncTestCase):
+    def test_mixed_routes_in_input_order(self):
+        sent = self.useTransport(lambda request: httpx.Response(200, json={'route': request.url.path}))
+        params = {'corpusName': 'childes'}
+
+        results = tbdb.batch([(tbdb.getTokenTypes, params), (tbdb.getNgrams, dict(params, nGram={'size': 2, 'type': 'word'})), (tbdb.getTranscripts, params)])
+
+        self.assertEqual(results, [{'route': '/getTokenTypes'}, {'route': '/getNgrams'}, {'route': '/getTranscriptSummary'}])
+        self.assertEqual(len(sent), 3)
+
+    def test_rejects_unsupported_functions(self):
+        sent = self.useTransport(lambda request: httpx.Response(200, json={}))
+
+        def getTokens(queryParams):
+            pass
+
+        for fn in (tbdb.getPathTrees, getTokens, print):
+            with self.assertRaises(ValueError):
+                tbdb.batch([(fn, {'corpusName': 'childes'})])
+
+        self.assertEqual(sent, [])
+
+
+class AsyncErrorTest(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(tbdb.asyncio, 'sleep', mock.AsyncMock())
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retries_transient_gateway_errors_with_backoff(self):
+        statuses = iter([502, 503, 200])
+        sent = self.useTransport(lambda request: httpx.Response(next(statuses), json={'data': []}))
+
+        self.assertEqual(tbdb.getTokensMany([{'corpusName': 'childes'}]), [{'data': []}])
+        self.assertEqual(len(sent), 3)
+        self.assertEqual([call.args[0] for call in self.sleep.await_args_list],
+                         [tbdb._BACKOFF_FACTOR, tbdb._BACKOFF_FACTOR * 2])
+
+    def test_gives_up_after_retries(self):
+        sent = self.useTransport(lambda request: httpx.Response(504))
+
+        with self.assertRaises(tbdb.BatchError):
+            tbdb.getTokensMany([{'corpusName': 'childes'}])
+
+        self.assertEqual(len(sent), tbdb._RETRIES + 1)
+
+    def test_batch_error_keeps_other_results(self):
+        def handler(request):
+            if queryVals(request)['corpusName'] == 'bad':
+                return httpx.Response(500, text='<html>Internal Server Error</html>')
+            return httpx.Response(200, json={'data': [[1]]})
+
+        self.useTransport(handler)
+
+        with self.assertRaises(tbdb.BatchError) as caught:
+            tbdb.getTokensMany([{'corpusName': 'good'}, {'corpusName': 'bad'}, {'corpusName': 'good'}])
+
+        results = caught.exception.results
+        self.assertEqual(results[0], {'data': [[1]]})
+        self.assertIsInstance(results[1], httpx.HTTPStatusError)
+        self.assertEqual(results[2], {'data': [[1]]})
+        self.assertIn('1 of 3', str(caught.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()